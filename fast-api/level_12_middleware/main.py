@@ -21,11 +21,13 @@ Test:
 
 from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from typing import Callable
+import os
 import time
 import uuid
+import hashlib
 import logging
 
 # Configure logging
@@ -35,7 +37,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Task Manager API - Level 12",
     description="Learning Middleware",
-    version="12.0.0"
+    version="12.0.0",
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json
 )
 
 
@@ -66,31 +69,9 @@ Use cases:
 # CONCEPT 2: Simple Function-Based Middleware
 # ============================================================
 
-@app.middleware("http")
-async def add_request_id(request: Request, call_next: Callable):
-    """
-    Add unique request ID to every request/response
-    
-    - Runs BEFORE request reaches endpoint
-    - Calls endpoint via call_next()
-    - Runs AFTER response is generated
-    """
-    # BEFORE: Generate request ID
-    request_id = str(uuid.uuid4())[:8]
-    
-    # Store in request state (accessible in endpoints)
-    request.state.request_id = request_id
-    
-    # Log incoming request
-    logger.info(f"[{request_id}] {request.method} {request.url.path}")
-    
-    # Call the actual endpoint
-    response = await call_next(request)
-    
-    # AFTER: Add request ID to response headers
-    response.headers["X-Request-ID"] = request_id
-    
-    return response
+# Set DISABLE_TIMING_HEADER=1 to skip timing (and its clock reads) entirely
+TIMING_ENABLED = not os.getenv("DISABLE_TIMING_HEADER")
+NO_TIMING_PATHS = {"/health"}
 
 
 @app.middleware("http")
@@ -98,14 +79,16 @@ async def timing_middleware(request: Request, call_next: Callable):
     """
     Measure and log request processing time
     """
-    start_time = time.time()
+    if not TIMING_ENABLED or request.scope["path"] in NO_TIMING_PATHS:
+        return await call_next(request)
+    
+    start_ns = time.perf_counter_ns()
     
     # Process request
     response = await call_next(request)
     
-    # Calculate duration
-    duration = time.time() - start_time
-    duration_ms = round(duration * 1000, 2)
+    # Calculate duration (integer milliseconds)
+    duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
     
     # Add timing header
     response.headers["X-Process-Time-MS"] = str(duration_ms)
@@ -154,7 +137,7 @@ app.add_middleware(
 # CONCEPT 4: Class-Based Middleware
 # ============================================================
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
     Class-based middleware for detailed logging
     
@@ -162,30 +145,56 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     - Can have __init__ for configuration
     - More structured than function-based
     - Can store state
+    
+    Written as plain ASGI so the body can be sampled as it streams
+    through `receive`, instead of buffering it with `await request.body()`
     """
     
+    MAX_BODY_LOG = 500  # bytes of request body to log
+    
     def __init__(self, app, log_request_body: bool = False):
-        super().__init__(app)
+        self.app = app
         self.log_request_body = log_request_body
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Log request details
+        request = Request(scope)
         logger.info(f"Request: {request.method} {request.url}")
         logger.info(f"Client: {request.client.host if request.client else 'unknown'}")
-        logger.info(f"Headers: {dict(request.headers)}")
+        logger.info("Headers: %s", [
+            (k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"]
+        ])
         
-        # Optionally log body (careful with large bodies!)
-        if self.log_request_body and request.method in ["POST", "PUT", "PATCH"]:
-            body = await request.body()
-            logger.info(f"Body: {body.decode()[:500]}")  # First 500 chars
+        # Optionally log body (only the first bytes are kept, any size is safe)
+        log_body = self.log_request_body and request.method in ["POST", "PUT", "PATCH"]
+        captured = bytearray()
+        status_code = None
+        
+        async def receive_with_capture():
+            message = await receive()
+            remaining = self.MAX_BODY_LOG - len(captured)
+            if message["type"] == "http.request" and remaining > 0:
+                captured.extend(message.get("body", b"")[:remaining])
+            return message
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
         # Process request
-        response = await call_next(request)
+        await self.app(scope, receive_with_capture if log_body else receive, send_with_status)
         
-        # Log response
-        logger.info(f"Response: {response.status_code}")
+        if log_body:
+            logger.info("Body: %s", captured.decode("utf-8", "replace"))
         
-        return response
+        # Log response
+        logger.info(f"Response: {status_code}")
 
 
 # Add class-based middleware
@@ -197,6 +206,14 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 # CONCEPT 5: Error Handling Middleware
 # ============================================================
 
+# Pre-serialized error body; request IDs are hex (or "unknown"), no escaping needed
+_ERR_PREFIX = (
+    b'{"error":"INTERNAL_SERVER_ERROR",'
+    b'"message":"An unexpected error occurred","request_id":"'
+)
+_ERR_SUFFIX = b'"}'
+
+
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     """
     Catch unhandled exceptions and return proper JSON responses
@@ -212,14 +229,11 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             request_id = getattr(request.state, 'request_id', 'unknown')
             logger.error(f"[{request_id}] Unhandled error: {exc}", exc_info=True)
             
-            # Return JSON error response
-            return JSONResponse(
+            # Return JSON error response (only request_id changes per error)
+            return Response(
+                content=_ERR_PREFIX + request_id.encode() + _ERR_SUFFIX,
                 status_code=500,
-                content={
-                    "error": "INTERNAL_SERVER_ERROR",
-                    "message": "An unexpected error occurred",
-                    "request_id": request_id
-                }
+                media_type="application/json"
             )
 
 
@@ -282,14 +296,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Note: For production, use Redis or similar
     """
     
+    # Longer client identifiers (e.g. X-Forwarded-For chains) get hashed,
+    # so each dict key stays small no matter what the client sends
+    _MAX_KEY_LEN = 64
+    
     def __init__(self, app, requests_per_minute: int = 60):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.requests = {}  # {ip: [(timestamp, count)]}
     
+    def _client_key(self, client_ip: str) -> str:
+        """Clamp client identifier to a bounded length"""
+        if len(client_ip) > self._MAX_KEY_LEN:
+            client_ip = hashlib.sha256(client_ip.encode()).hexdigest()[:32]
+        return client_ip
+    
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
+        client_ip = self._client_key(
+            request.client.host if request.client else "unknown"
+        )
         current_time = time.time()
         
         # Clean old entries (older than 1 minute)
@@ -339,7 +365,9 @@ async def normalize_headers(request: Request, call_next: Callable):
     Middleware that processes/normalizes request data
     """
     # Example: Store lowercase path for case-insensitive routing
-    request.state.normalized_path = request.url.path.lower()
+    # (a str, percent-decoded: scope["path"] is what request.url.path
+    # returns, without building a URL object for every request)
+    request.state.normalized_path = request.scope["path"].lower()
     
     response = await call_next(request)
     return response
@@ -349,24 +377,59 @@ async def normalize_headers(request: Request, call_next: Callable):
 # CONCEPT 9: Response Modification Middleware
 # ============================================================
 
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next: Callable):
-    """
-    Add security headers to all responses
+# Security headers, encoded once at import (raw ASGI headers are bytes)
+_SECURITY_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+]
+_NO_STORE = (b"cache-control", b"no-store")
+
+
+class FastHeaderMiddleware:
     """
-    response = await call_next(request)
+    Pure ASGI middleware: request ID + security headers in one pass
     
-    # Security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+    - No BaseHTTPMiddleware, so no extra task / call_next hop
+    - Runs BEFORE the endpoint: generates request ID, stores in request.state
+    - Runs AFTER: stamps headers onto the "http.response.start" message
+    """
     
-    # Cache control (adjust as needed)
-    if "Cache-Control" not in response.headers:
-        response.headers["Cache-Control"] = "no-store"
+    def __init__(self, app):
+        self.app = app
     
-    return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # BEFORE: Generate request ID and store in request state
+        request_id = str(uuid.uuid4())[:8]
+        scope.setdefault("state", {})["request_id"] = request_id
+        
+        # Log incoming request
+        logger.info(f"[{request_id}] {scope['method']} {scope['path']}")
+        
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # AFTER: Add request ID and security headers
+                headers = message.setdefault("headers", [])
+                # Cache control (adjust as needed)
+                has_cache_control = any(
+                    name.lower() == b"cache-control" for name, _ in headers
+                )
+                headers.append((b"x-request-id", request_id.encode()))
+                headers.extend(_SECURITY_HEADERS)
+                if not has_cache_control:
+                    headers.append(_NO_STORE)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+
+
+# Added last, so it wraps everything (runs first on request)
+app.add_middleware(FastHeaderMiddleware)
 
 
 # ============================================================
@@ -447,11 +510,16 @@ def error_endpoint():
 def show_headers(request: Request):
     """
     Show all request headers
+    
+    Reads the raw (bytes, bytes) pairs instead of building a dict;
+    latin-1 is the byte-for-byte codec for HTTP header values
     """
-    return {
-        "headers": dict(request.headers),
+    return ORJSONResponse({
+        "headers": [
+            (k.decode("latin-1"), v.decode("latin-1")) for k, v in request.headers.raw
+        ],
         "client_ip": request.client.host if request.client else None
-    }
+    })
 
 
 @app.get("/middleware-info")
@@ -461,9 +529,8 @@ def middleware_info():
     """
     return {
         "active_middleware": [
-            "add_request_id - Adds X-Request-ID header",
+            "FastHeaderMiddleware - Adds X-Request-ID and security headers",
             "timing_middleware - Adds X-Process-Time-MS header",
-            "add_security_headers - Adds security headers",
             "normalize_headers - Normalizes request path",
             "CORSMiddleware - Handles CORS",
             "ErrorHandlingMiddleware - Catches unhandled errors"
@@ -493,7 +560,7 @@ def info():
             "Timing middleware",
             "Logging middleware",
             "Error handling middleware",
-            "Security headers middleware",
+            "Security headers middleware (pure ASGI)",
             "Rate limiting middleware"
         ],
         "test_endpoints": [
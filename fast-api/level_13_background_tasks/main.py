@@ -18,12 +18,15 @@ Test:
     Watch console for background task output
 """
 
-from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException
-from pydantic import BaseModel, EmailStr
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, ValidationError
 from typing import Optional, List
 from datetime import datetime
-import time
+from collections import deque
 import asyncio
+import itertools
 import logging
 
 # Configure logging to see background task output
@@ -36,7 +39,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Task Manager API - Level 13",
     description="Learning Background Tasks",
-    version="13.0.0"
+    version="13.0.0",
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json
 )
 
 
@@ -64,6 +68,10 @@ Limitations:
 - Lost if server restarts
 - Not suitable for very long tasks
 - For heavy tasks, use Celery/RQ/etc.
+
+Sync `def` tasks run in a threadpool; `async def` tasks run on the event
+loop. The simulated I/O below uses `await asyncio.sleep()` so waiting
+never ties up a threadpool slot.
 """
 
 
@@ -72,22 +80,25 @@ Limitations:
 # ============================================================
 
 tasks_db = {}
-notifications_log = []
-audit_log = []
+_next_id = itertools.count(1)  # atomic ID allocation (no len()+1 race)
+# Ring buffers: O(1) append, oldest entries drop off past MAX_LOG_ENTRIES
+MAX_LOG_ENTRIES = 10_000
+notifications_log = deque(maxlen=MAX_LOG_ENTRIES)
+audit_log = deque(maxlen=MAX_LOG_ENTRIES)
 
 
 # ============================================================
 # CONCEPT 2: Basic Background Task
 # ============================================================
 
-def write_log(message: str):
+async def write_log(message: str):
     """
     Simple background task - writes to log
     
     This runs AFTER response is sent
     """
     logger.info(f"[Background] Writing log: {message}")
-    time.sleep(1)  # Simulate slow operation
+    await asyncio.sleep(1)  # Simulate slow operation
     audit_log.append({
         "message": message,
         "timestamp": datetime.now().isoformat()
@@ -109,7 +120,7 @@ def create_task(
     Watch console for background task output!
     """
     # Create task
-    task_id = len(tasks_db) + 1
+    task_id = next(_next_id)
     task = {
         "id": task_id,
         "title": title,
@@ -131,7 +142,7 @@ def create_task(
 # CONCEPT 3: Background Task with Multiple Parameters
 # ============================================================
 
-def send_email_notification(
+async def send_email_notification(
     email: str,
     subject: str,
     body: str,
@@ -141,7 +152,7 @@ def send_email_notification(
     Simulate sending email (background task)
     """
     logger.info(f"[Background] Sending email to {email}...")
-    time.sleep(2)  # Simulate email sending delay
+    await asyncio.sleep(2)  # Simulate email sending delay
     
     notifications_log.append({
         "type": "email",
@@ -160,18 +171,39 @@ class TaskCreate(BaseModel):
     assignee_email: Optional[EmailStr] = None
 
 
-@app.post("/tasks/with-notification")
-def create_task_with_notification(
-    task_data: TaskCreate,
+@app.post(
+    "/tasks/with-notification",
+    # Body is parsed manually below, so describe it for /docs here
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": TaskCreate.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
+async def create_task_with_notification(
+    request: Request,
     background_tasks: BackgroundTasks
 ):
     """
     Create task and send email notification in background
     
     Response returns immediately, email sends in background
+    
+    The body goes straight from raw bytes to TaskCreate via
+    model_validate_json (no intermediate dict)
     """
+    try:
+        task_data = TaskCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Same shape as FastAPI's own body errors: loc starts with "body"
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+    
     # Create task
-    task_id = len(tasks_db) + 1
+    task_id = next(_next_id)
     task = {
         "id": task_id,
         "title": task_data.title,
@@ -208,24 +240,24 @@ def create_task_with_notification(
 # CONCEPT 4: Multiple Background Tasks
 # ============================================================
 
-def update_search_index(task_id: int, title: str):
+async def update_search_index(task_id: int, title: str):
     """Simulate updating search index"""
     logger.info(f"[Background] Updating search index for task {task_id}...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     logger.info(f"[Background] Search index updated")
 
 
-def notify_webhook(url: str, data: dict):
+async def notify_webhook(url: str, data: dict):
     """Simulate sending webhook"""
     logger.info(f"[Background] Sending webhook to {url}...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     logger.info(f"[Background] Webhook sent")
 
 
-def update_analytics(event: str, metadata: dict):
+async def update_analytics(event: str, metadata: dict):
     """Simulate updating analytics"""
     logger.info(f"[Background] Recording analytics: {event}...")
-    time.sleep(0.5)
+    await asyncio.sleep(0.5)
     logger.info(f"[Background] Analytics recorded")
 
 
@@ -244,7 +276,7 @@ def create_task_full(
     3. Send webhook (if URL provided)
     4. Update analytics
     """
-    task_id = len(tasks_db) + 1
+    task_id = next(_next_id)
     task = {
         "id": task_id,
         "title": title,
@@ -321,12 +353,12 @@ async def upload_file(
 temp_files = []
 
 
-def cleanup_temp_files(file_ids: List[int]):
+async def cleanup_temp_files(file_ids: List[int]):
     """
     Background task to cleanup temporary files
     """
     logger.info(f"[Background] Cleaning up {len(file_ids)} temp files...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     
     for file_id in file_ids:
         if file_id in temp_files:
@@ -363,7 +395,7 @@ def export_data(
 # CONCEPT 7: Background Task with Error Handling
 # ============================================================
 
-def risky_background_task(task_id: int, should_fail: bool = False):
+async def risky_background_task(task_id: int, should_fail: bool = False):
     """
     Background task that might fail
     
@@ -375,7 +407,7 @@ def risky_background_task(task_id: int, should_fail: bool = False):
         if should_fail:
             raise ValueError("Simulated error!")
         
-        time.sleep(1)
+        await asyncio.sleep(1)
         logger.info(f"[Background] Risky task completed successfully")
         
     except Exception as e:
@@ -412,26 +444,26 @@ def process_task(
 # CONCEPT 8: Chained Background Tasks
 # ============================================================
 
-def step_one(task_id: int, results: dict):
+async def step_one(task_id: int, results: dict):
     """First step of processing"""
     logger.info(f"[Background] Step 1 starting for task {task_id}...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     results["step_one"] = "completed"
     logger.info(f"[Background] Step 1 completed")
 
 
-def step_two(task_id: int, results: dict):
+async def step_two(task_id: int, results: dict):
     """Second step - runs after step one"""
     logger.info(f"[Background] Step 2 starting for task {task_id}...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     results["step_two"] = "completed"
     logger.info(f"[Background] Step 2 completed")
 
 
-def step_three(task_id: int, results: dict):
+async def step_three(task_id: int, results: dict):
     """Final step"""
     logger.info(f"[Background] Step 3 starting for task {task_id}...")
-    time.sleep(1)
+    await asyncio.sleep(1)
     results["step_three"] = "completed"
     
     # Update task with results
@@ -441,6 +473,18 @@ def step_three(task_id: int, results: dict):
     logger.info(f"[Background] All steps completed: {results}")
 
 
+async def run_pipeline_steps(task_id: int, results: dict):
+    """
+    Whole pipeline as one background task
+    
+    Awaiting the steps here keeps their order while scheduling
+    a single task instead of three
+    """
+    await step_one(task_id, results)
+    await step_two(task_id, results)
+    await step_three(task_id, results)
+
+
 processing_results = {}
 
 
@@ -461,10 +505,8 @@ def run_pipeline(
     results = {"task_id": task_id, "started_at": datetime.now().isoformat()}
     processing_results[task_id] = results
     
-    # Add tasks in order (they run sequentially)
-    background_tasks.add_task(step_one, task_id, results)
-    background_tasks.add_task(step_two, task_id, results)
-    background_tasks.add_task(step_three, task_id, results)
+    # One background task that runs the steps sequentially
+    background_tasks.add_task(run_pipeline_steps, task_id, results)
     
     return {
         "message": "Pipeline started",
@@ -502,7 +544,7 @@ def list_tasks(background_tasks: BackgroundTasks):
     
     return {
         "total": len(tasks_db),
-        "tasks": list(tasks_db.values())
+        "tasks": tuple(tasks_db.values())
     }
 
 
@@ -513,13 +555,13 @@ def list_tasks(background_tasks: BackgroundTasks):
 @app.get("/logs/audit")
 def get_audit_log():
     """View audit log (populated by background tasks)"""
-    return {"audit_log": audit_log}
+    return {"audit_log": list(audit_log)}
 
 
 @app.get("/logs/notifications")
 def get_notifications():
     """View notification log"""
-    return {"notifications": notifications_log}
+    return {"notifications": list(notifications_log)}
 
 
 @app.delete("/logs")
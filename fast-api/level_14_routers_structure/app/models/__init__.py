@@ -1,2 +1,2 @@
 # Models module - database models
-from app.models.database import tasks_db, users_db
+from app.models.database import tasks_db, users_db, TaskRow, UserRow
@@ -5,76 +5,108 @@ In a real application, this would be SQLAlchemy models
 or other database connection.
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+# Rows are slotted dataclasses: each table declares its fields once, so
+# every row has the same fixed layout with no per-row dict, and attribute
+# access is a fixed offset instead of a hash lookup (rows stay mutable)
+@dataclass(slots=True)
+class TaskRow:
+    id: int
+    title: str
+    description: Optional[str]
+    status: str
+    priority: int
+    owner_id: str
+    created_at: str
+    updated_at: str
+
+
+@dataclass(slots=True)
+class UserRow:
+    id: str
+    username: str
+    email: str
+    full_name: Optional[str]
+    role: str
+    is_active: bool
+    created_at: str
+
 
 # Simulated Tasks Database
-tasks_db = {
-    1: {
-        "id": 1,
-        "title": "Learn FastAPI",
-        "description": "Complete FastAPI tutorial",
-        "status": "completed",
-        "priority": 5,
-        "owner_id": "user1",
-        "created_at": "2024-01-01T10:00:00",
-        "updated_at": "2024-01-02T15:30:00"
-    },
-    2: {
-        "id": 2,
-        "title": "Build REST API",
-        "description": "Create a production API",
-        "status": "in_progress",
-        "priority": 4,
-        "owner_id": "user1",
-        "created_at": "2024-01-03T09:00:00",
-        "updated_at": "2024-01-03T09:00:00"
-    },
-    3: {
-        "id": 3,
-        "title": "Write Tests",
-        "description": "Add unit and integration tests",
-        "status": "pending",
-        "priority": 3,
-        "owner_id": "admin",
-        "created_at": "2024-01-04T11:00:00",
-        "updated_at": "2024-01-04T11:00:00"
-    }
+tasks_db: Dict[int, TaskRow] = {
+    1: TaskRow(
+        id=1,
+        title="Learn FastAPI",
+        description="Complete FastAPI tutorial",
+        status="completed",
+        priority=5,
+        owner_id="user1",
+        created_at="2024-01-01T10:00:00",
+        updated_at="2024-01-02T15:30:00"
+    ),
+    2: TaskRow(
+        id=2,
+        title="Build REST API",
+        description="Create a production API",
+        status="in_progress",
+        priority=4,
+        owner_id="user1",
+        created_at="2024-01-03T09:00:00",
+        updated_at="2024-01-03T09:00:00"
+    ),
+    3: TaskRow(
+        id=3,
+        title="Write Tests",
+        description="Add unit and integration tests",
+        status="pending",
+        priority=3,
+        owner_id="admin",
+        created_at="2024-01-04T11:00:00",
+        updated_at="2024-01-04T11:00:00"
+    )
 }
 
 # Simulated Users Database
-users_db = {
-    "admin": {
-        "id": "admin",
-        "username": "admin",
-        "email": "admin@example.com",
-        "full_name": "Admin User",
-        "role": "admin",
-        "is_active": True,
-        "created_at": "2024-01-01T00:00:00"
-    },
-    "user1": {
-        "id": "user1",
-        "username": "john_doe",
-        "email": "john@example.com",
-        "full_name": "John Doe",
-        "role": "user",
-        "is_active": True,
-        "created_at": "2024-01-02T00:00:00"
-    },
-    "user2": {
-        "id": "user2",
-        "username": "jane_doe",
-        "email": "jane@example.com",
-        "full_name": "Jane Doe",
-        "role": "user",
-        "is_active": False,  # Inactive user
-        "created_at": "2024-01-03T00:00:00"
-    }
+users_db: Dict[str, UserRow] = {
+    "admin": UserRow(
+        id="admin",
+        username="admin",
+        email="admin@example.com",
+        full_name="Admin User",
+        role="admin",
+        is_active=True,
+        created_at="2024-01-01T00:00:00"
+    ),
+    "user1": UserRow(
+        id="user1",
+        username="john_doe",
+        email="john@example.com",
+        full_name="John Doe",
+        role="user",
+        is_active=True,
+        created_at="2024-01-02T00:00:00"
+    ),
+    "user2": UserRow(
+        id="user2",
+        username="jane_doe",
+        email="jane@example.com",
+        full_name="Jane Doe",
+        role="user",
+        is_active=False,  # Inactive user
+        created_at="2024-01-03T00:00:00"
+    )
 }
 
 
+# Highest ID handed out so far (scanned once here, not on every insert)
+_next_task_id = max(tasks_db.keys(), default=0)
+
+
 def get_next_task_id() -> int:
     """Get next available task ID"""
-    if not tasks_db:
-        return 1
-    return max(tasks_db.keys()) + 1
+    global _next_task_id
+    _next_task_id += 1
+    return _next_task_id
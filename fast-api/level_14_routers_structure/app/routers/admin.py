@@ -13,7 +13,7 @@ from typing import List
 from app.schemas.user import UserResponse
 from app.schemas.task import TaskResponse
 from app.models.database import users_db, tasks_db
-from app.core.dependencies import require_admin
+from app.core.dependencies import require_admin, clear_user_cache
 
 # Create router with default dependency
 # All endpoints in this router require admin
@@ -33,11 +33,11 @@ def admin_dashboard():
     
     Requires admin role (X-User-Id: admin)
     """
-    active_users = sum(1 for u in users_db.values() if u.get("is_active", True))
+    active_users = sum(1 for u in users_db.values() if u.is_active)
     
     tasks_by_status = {}
     for task in tasks_db.values():
-        status = task["status"]
+        status = task.status
         tasks_by_status[status] = tasks_by_status.get(status, 0) + 1
     
     return {
@@ -69,7 +69,7 @@ def activate_user(user_id: str):
             detail=f"User {user_id} not found"
         )
     
-    users_db[user_id]["is_active"] = True
+    users_db[user_id].is_active = True
     return {"message": f"User {user_id} activated"}
 
 
@@ -84,7 +84,7 @@ def deactivate_user(user_id: str):
             detail=f"User {user_id} not found"
         )
     
-    users_db[user_id]["is_active"] = False
+    users_db[user_id].is_active = False
     return {"message": f"User {user_id} deactivated"}
 
 
@@ -106,6 +106,7 @@ def delete_user(user_id: str):
         )
     
     del users_db[user_id]
+    clear_user_cache()
 
 
 @router.get("/tasks", response_model=List[TaskResponse])
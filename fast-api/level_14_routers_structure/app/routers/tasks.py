@@ -6,14 +6,13 @@ All task-related endpoints.
 This router is mounted at /tasks in main.py
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Annotated
 from datetime import datetime
 
 from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
-from app.models.database import tasks_db, get_next_task_id
+from app.models.database import tasks_db, get_next_task_id, TaskRow, UserRow
 from app.core.dependencies import (
-    Pagination,
     CommonQueryParams,
     get_current_active_user
 )
@@ -28,9 +27,8 @@ router = APIRouter()
 
 @router.get("", response_model=TaskListResponse)
 def list_tasks(
-    pagination: Pagination = Depends(),
-    common: CommonQueryParams = Depends(),
-    current_user: dict = Depends(get_current_active_user)
+    common: Annotated[CommonQueryParams, Query()],
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     List all tasks with pagination and filtering
@@ -45,23 +43,22 @@ def list_tasks(
     
     # Filter by search query
     if common.q:
-        tasks = [t for t in tasks if common.q.lower() in t["title"].lower()]
+        tasks = [t for t in tasks if common.q.lower() in t.title.lower()]
     
     # Sort
     if common.sort_by and common.sort_by in ["title", "priority", "status"]:
-        reverse = common.sort_order == "desc"
-        tasks = sorted(tasks, key=lambda x: x.get(common.sort_by, ""), reverse=reverse)
+        tasks = sorted(tasks, key=lambda x: getattr(x, common.sort_by), reverse=common.reverse)
     
     # Get total before pagination
     total = len(tasks)
     
     # Apply pagination
-    tasks = tasks[pagination.skip:pagination.skip + pagination.limit]
+    tasks = tasks[common.skip:common.skip + common.size]
     
     return TaskListResponse(
         total=total,
-        page=pagination.page,
-        size=pagination.size,
+        page=common.page,
+        size=common.size,
         tasks=tasks
     )
 
@@ -69,7 +66,7 @@ def list_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: int,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Get a specific task by ID
@@ -85,7 +82,7 @@ def get_task(
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     task: TaskCreate,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Create a new task
@@ -93,16 +90,16 @@ def create_task(
     task_id = get_next_task_id()
     now = datetime.now().isoformat()
     
-    new_task = {
-        "id": task_id,
-        "title": task.title,
-        "description": task.description,
-        "status": task.status.value,
-        "priority": task.priority,
-        "owner_id": current_user["id"],
-        "created_at": now,
-        "updated_at": now
-    }
+    new_task = TaskRow(
+        id=task_id,
+        title=task.title,
+        description=task.description,
+        status=task.status.value,
+        priority=task.priority,
+        owner_id=current_user.id,
+        created_at=now,
+        updated_at=now
+    )
     
     tasks_db[task_id] = new_task
     return new_task
@@ -112,7 +109,7 @@ def create_task(
 def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Update an existing task
@@ -126,7 +123,7 @@ def update_task(
     task = tasks_db[task_id]
     
     # Check ownership (unless admin)
-    if task["owner_id"] != current_user["id"] and current_user["role"] != "admin":
+    if task.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only update your own tasks"
@@ -137,11 +134,11 @@ def update_task(
     for field, value in update_data.items():
         if value is not None:
             if field == "status":
-                task[field] = value.value
+                task.status = value.value
             else:
-                task[field] = value
+                setattr(task, field, value)
     
-    task["updated_at"] = datetime.now().isoformat()
+    task.updated_at = datetime.now().isoformat()
     
     return task
 
@@ -149,7 +146,7 @@ def update_task(
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     task_id: int,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Delete a task
@@ -163,7 +160,7 @@ def delete_task(
     task = tasks_db[task_id]
     
     # Check ownership (unless admin)
-    if task["owner_id"] != current_user["id"] and current_user["role"] != "admin":
+    if task.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete your own tasks"
@@ -174,13 +171,13 @@ def delete_task(
 
 @router.get("/my/tasks", response_model=List[TaskResponse])
 def get_my_tasks(
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Get tasks owned by current user
     """
     my_tasks = [
         t for t in tasks_db.values()
-        if t["owner_id"] == current_user["id"]
+        if t.owner_id == current_user.id
     ]
     return my_tasks
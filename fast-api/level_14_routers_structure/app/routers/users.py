@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.models.database import users_db
+from app.models.database import users_db, UserRow
 from app.core.dependencies import get_current_active_user
 
 # Create router
@@ -23,7 +23,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_profile(
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Get current user's profile
@@ -36,17 +36,17 @@ def get_current_user_profile(
 @router.put("/me", response_model=UserResponse)
 def update_current_user(
     user_update: UserUpdate,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Update current user's profile
     """
-    user = users_db[current_user["id"]]
+    user = users_db[current_user.id]
     
     update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         if value is not None:
-            user[field] = value
+            setattr(user, field, value)
     
     return user
 
@@ -54,7 +54,7 @@ def update_current_user(
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: str,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     Get a user by ID
@@ -69,7 +69,7 @@ def get_user(
 
 @router.get("", response_model=List[UserResponse])
 def list_users(
-    current_user: dict = Depends(get_current_active_user)
+    current_user: UserRow = Depends(get_current_active_user)
 ):
     """
     List all users
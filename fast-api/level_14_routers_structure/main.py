@@ -34,6 +34,7 @@ Test:
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.routers import tasks, users, admin
 from app.core.config import settings
 
@@ -43,7 +44,8 @@ app = FastAPI(
     description="Learning APIRouter & Project Structure",
     version=settings.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json
 )
 
 
@@ -22,14 +22,21 @@ from app.core.config import settings
 # It maintains a pool of connections to the database
 
 # For SQLite, we need connect_args to allow multi-threading
+# A file-based SQLite URL already gets a QueuePool in SQLAlchemy 2.0,
+# so connections are reused across requests (no re-open per session)
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False}  # Only for SQLite
     # For PostgreSQL/MySQL, remove connect_args
 )
 
-# For PostgreSQL:
-# engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# For PostgreSQL (size the pool for your worker count):
+# engine = create_engine(
+#     settings.DATABASE_URL,
+#     pool_pre_ping=True,  # Drop dead connections before use
+#     pool_size=10,        # Connections kept open per process
+#     max_overflow=20,     # Extra connections allowed under bursts
+# )
 
 
 # ============================================================
@@ -39,10 +46,13 @@ engine = create_engine(
 # Each request gets its own session
 
 SessionLocal = sessionmaker(
-    autocommit=False,  # Don't auto-commit (we control transactions)
-    autoflush=False,   # Don't auto-flush (we control when to flush)
-    bind=engine        # Bind to our engine
+    autocommit=False,        # Don't auto-commit (we control transactions)
+    autoflush=False,         # Don't auto-flush (we control when to flush)
+    expire_on_commit=False,  # Keep loaded attributes after commit
+    bind=engine              # Bind to our engine
 )
+# expire_on_commit=False skips expiring every loaded object on commit;
+# endpoints call db.refresh() when they need server-generated values
 
 
 # ============================================================
@@ -14,6 +14,12 @@ from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskWithOwner
 
 router = APIRouter()
 
+# Pre-built error for the status filter (re-raised with a fresh traceback)
+_ERR_UNKNOWN_STATUS = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    detail=f"Unknown status, expected one of: {', '.join(TaskStatus._value2member_map_)}"
+)
+
 
 # ============================================================
 # CREATE - POST /tasks
@@ -71,6 +77,9 @@ def list_tasks(
     
     # Apply filters
     if status:
+        # Validate with a single dict lookup instead of TaskStatus(status)
+        if status not in TaskStatus._value2member_map_:
+            raise _ERR_UNKNOWN_STATUS.with_traceback(None)
         query = query.filter(Task.status == status)
     if priority:
         query = query.filter(Task.priority == priority)
@@ -33,12 +33,14 @@ Project Structure:
 
 Run Command:
     uvicorn main:app --reload
+    python main.py                # uvloop + httptools, no reload
 
 Test:
     http://127.0.0.1:8000/docs
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.core.database import engine, Base
 from app.routers import tasks, users
 
@@ -49,7 +51,8 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Task Manager API - Level 15",
     description="Database Integration with SQLAlchemy",
-    version="15.0.0"
+    version="15.0.0",
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json
 )
 
 # Include routers
@@ -86,3 +89,23 @@ def root():
 def health():
     """Health check"""
     return {"status": "healthy", "database": "connected"}
+
+
+# ============================================================
+# Run with uvloop + httptools
+# ============================================================
+# Both ship with uvicorn[standard]: libuv event loop and C HTTP parser.
+# (uvloop is not available on Windows; use plain `uvicorn main:app` there)
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",       # Cython/libuv event loop
+        http="httptools",    # C HTTP parser
+        workers=1,
+        log_level="info"
+    )
@@ -19,6 +19,7 @@ class Database:
     def __init__(self):
         self.tasks: Dict[int, dict] = {}
         self.users: Dict[str, dict] = {}
+        self._api_key_index: Dict[str, dict] = {}  # api_key -> user
         self._task_counter = 0
         self._initialize_data()
     
@@ -37,6 +38,7 @@ class Database:
                 "role": "user"
             }
         }
+        self._api_key_index = {u["api_key"]: u for u in self.users.values()}
         
         # Sample tasks
         self.create_task("Learn FastAPI", "Complete the tutorial", 1, 5)
@@ -52,6 +54,7 @@ class Database:
         """Clear all data"""
         self.tasks = {}
         self.users = {}
+        self._api_key_index = {}
         self._task_counter = 0
     
     # Task operations
@@ -105,11 +108,8 @@ class Database:
     
     # User operations
     def get_user_by_api_key(self, api_key: str) -> Optional[dict]:
-        """Get user by API key"""
-        for user in self.users.values():
-            if user["api_key"] == api_key:
-                return user
-        return None
+        """Get user by API key (hashed lookup, no scan)"""
+        return self._api_key_index.get(api_key)
 
 
 # Global database instance
@@ -143,3 +143,10 @@ class TestAuthEdgeCases:
         response = client.post("/tasks", json={"title": "Test"})
         
         assert response.status_code == 401
+    
+    def test_api_key_rejected_after_clear(self, client, empty_db):
+        """Test that cleared users can no longer authenticate"""
+        client.headers["X-API-Key"] = "admin-key-123"
+        response = client.post("/tasks", json={"title": "Test"})
+        
+        assert response.status_code == 401
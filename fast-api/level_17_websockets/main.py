@@ -15,6 +15,7 @@ Concepts Covered:
 
 Run Command:
     uvicorn main:app --reload
+    python main.py                # uvloop + httptools, no reload
 
 Test:
     1. Open http://127.0.0.1:8000 in browser
@@ -24,14 +25,40 @@ Test:
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from typing import List, Dict, Optional
+from collections import defaultdict
+from contextlib import asynccontextmanager, suppress
+from typing import Dict, Literal, Optional, Set
 from datetime import datetime
-import json
+import asyncio
+import hmac
+import itertools
+import logging
+import os
+import sys
+import uuid
+import weakref
+import msgpack
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional: only needed when REDIS_URL is set
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await manager.close()
+
 
 app = FastAPI(
     title="Task Manager API - Level 17",
     description="Learning WebSockets",
-    version="17.0.0"
+    version="17.0.0",
+    lifespan=lifespan
 )
 
 
@@ -39,6 +66,14 @@ app = FastAPI(
 # CONCEPT 1: Connection Manager
 # ============================================================
 
+# Max concurrent sends per broadcast batch
+BROADCAST_BATCH = 50
+
+# Wire protocol, chosen per connection with ?proto=
+# (json: text frames, msgpack: binary frames)
+Proto = Literal["json", "msgpack"]
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections
@@ -52,71 +87,354 @@ class ConnectionManager:
     
     def __init__(self):
         # All active connections
-        self.active_connections: List[WebSocket] = []
+        # (sets: O(1) add/remove, WebSocket hashes by identity)
+        self.active_connections: Set[WebSocket] = set()
         
         # Connections by room/channel
-        self.rooms: Dict[str, List[WebSocket]] = {}
+        self.rooms: Dict[str, Set[WebSocket]] = {}
         
         # User to connection mapping
         self.user_connections: Dict[str, WebSocket] = {}
+        
+        # Connections that speak msgpack instead of JSON
+        self.msgpack_connections: Set[WebSocket] = set()
     
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, proto: Proto = "json"):
         """Accept and store a new connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        if proto == "msgpack":
+            self.msgpack_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket):
         """Remove a connection"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.msgpack_connections.discard(websocket)
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send message to a specific client"""
         await websocket.send_text(message)
     
+    async def send_json(self, payload: dict, websocket: WebSocket):
+        """Send JSON to a specific client (orjson instead of stdlib json)"""
+        if websocket in self.msgpack_connections:
+            await websocket.send_bytes(msgpack.packb(payload))
+        else:
+            await websocket.send_text(orjson.dumps(payload).decode())
+    
+    async def receive_json(self, websocket: WebSocket):
+        """Receive and parse a JSON text frame with orjson"""
+        if websocket in self.msgpack_connections:
+            return msgpack.unpackb(await websocket.receive_bytes())
+        return orjson.loads(await websocket.receive_text())
+    
+    async def iter_json(self, websocket: WebSocket):
+        """Like websocket.iter_json(), parsing with orjson (or msgpack)"""
+        if websocket in self.msgpack_connections:
+            async for data in websocket.iter_bytes():
+                yield msgpack.unpackb(data)
+        else:
+            async for text in websocket.iter_text():
+                yield orjson.loads(text)
+    
     async def broadcast(self, message: str):
         """Send message to ALL connected clients"""
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        connections = self.active_connections
+        await self._fan_out(
+            connections, message,
+            packed=self._msgpack_copy(connections, message, is_json=False)
+        )
+    
+    async def broadcast_json(
+        self,
+        payload: dict,
+        room: Optional[str] = None,
+        exclude: Optional[WebSocket] = None
+    ):
+        """
+        Serialize payload once (orjson) and send it to everyone,
+        or only to a room's members when room is given
+        (skipping `exclude`, e.g. the sender, if given)
+        """
+        message = orjson.dumps(payload).decode()
+        if room is None:
+            connections = self.active_connections - {exclude}
+            await self._fan_out(
+                connections, message,
+                packed=self._msgpack_copy(connections, message)
+            )
+        else:
+            await self.broadcast_to_room(room, message, exclude)
+    
+    def _msgpack_copy(
+        self, connections, message: str, is_json: bool = True
+    ) -> Optional[bytes]:
+        """
+        msgpack re-encoding of a message, if any recipient needs it
+        (JSON is re-encoded as its value, plain text as a string)
+        """
+        if self.msgpack_connections.isdisjoint(connections):
+            return None
+        return msgpack.packb(orjson.loads(message) if is_json else message)
+    
+    async def _fan_out(
+        self,
+        connections,
+        message: str,
+        room: Optional[str] = None,
+        packed: Optional[bytes] = None
+    ):
+        """
+        Send to all connections concurrently, BROADCAST_BATCH at a time
+        
+        Yields to the event loop between batches so a large room
+        doesn't starve other coroutines.
+        msgpack clients get `packed` (when given) instead of the text.
+        Clients whose send fails are dropped (and removed from room)
+        """
+        # Immutable snapshot: connect/disconnect may run while we await
+        connections = tuple(connections)
+        # One ASGI send event shared by every recipient
+        # (same event send_text builds, but only once per broadcast)
+        event = {"type": "websocket.send", "text": message}
+        binary_event = {"type": "websocket.send", "bytes": packed}
+        binary = self.msgpack_connections if packed is not None else ()
+        failed = []
+        for start in range(0, len(connections), BROADCAST_BATCH):
+            if start:
+                await asyncio.sleep(0)
+            batch = connections[start:start + BROADCAST_BATCH]
+            results = await asyncio.gather(
+                *(
+                    connection.send(binary_event if connection in binary else event)
+                    for connection in batch
+                ),
+                return_exceptions=True
+            )
+            failed.extend(
+                connection for connection, result in zip(batch, results)
+                if isinstance(result, Exception)
+            )
+        
+        for connection in failed:
+            if room is not None:
+                await self.leave_room(room, connection)
+            self.disconnect(connection)
     
     # Room-based methods
     async def join_room(self, room: str, websocket: WebSocket):
         """Add connection to a room"""
-        if room not in self.rooms:
-            self.rooms[room] = []
-        self.rooms[room].append(websocket)
+        self.rooms.setdefault(room, set()).add(websocket)
     
-    def leave_room(self, room: str, websocket: WebSocket):
+    async def leave_room(self, room: str, websocket: WebSocket):
         """Remove connection from a room"""
-        if room in self.rooms and websocket in self.rooms[room]:
-            self.rooms[room].remove(websocket)
-            if not self.rooms[room]:
+        connections = self.rooms.get(room)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.rooms[room]
     
-    async def broadcast_to_room(self, room: str, message: str):
-        """Send message to all clients in a room"""
-        if room in self.rooms:
-            for connection in self.rooms[room]:
-                await connection.send_text(message)
+    async def broadcast_to_room(
+        self,
+        room: str,
+        message: str,
+        exclude: Optional[WebSocket] = None
+    ):
+        """Send (JSON) message to all clients in a room, except `exclude`"""
+        connections = self.rooms.get(room)
+        if not connections:
+            return
+        if exclude is not None:
+            # Sender alone in the room: nobody to send to
+            if len(connections) == 1 and exclude in connections:
+                return
+            connections = connections - {exclude}
+        await self._fan_out(
+                connections, message, room,
+                packed=self._msgpack_copy(connections, message)
+            )
     
     # User-based methods
+    # Usernames are interned, so repeat lookups can match keys by identity
     def register_user(self, username: str, websocket: WebSocket):
         """Register a user's connection"""
-        self.user_connections[username] = websocket
+        self.user_connections[sys.intern(username)] = websocket
     
     def unregister_user(self, username: str):
         """Unregister a user"""
-        if username in self.user_connections:
-            del self.user_connections[username]
+        self.user_connections.pop(sys.intern(username), None)
     
     async def send_to_user(self, username: str, message: str):
         """Send message to a specific user"""
-        if username in self.user_connections:
-            await self.user_connections[username].send_text(message)
+        websocket = self.user_connections.get(sys.intern(username))
+        if websocket is not None:
+            await websocket.send_text(message)
+    
+    async def close(self):
+        """Release resources on shutdown (nothing to do in-process)"""
+
+
+# ============================================================
+# CONCEPT 1b: Scaling Out with Redis Pub/Sub
+# ============================================================
+# An in-process manager only reaches sockets connected to THIS worker.
+# With several workers, room messages go through Redis instead:
+# every worker publishes to "events:room:{room}" and subscribes only
+# to the rooms that have local members.
+
+class RedisConnectionManager(ConnectionManager):
+    """
+    Connection manager that fans room messages out via Redis pub/sub
+    
+    - broadcast_to_room publishes instead of sending directly
+    - A listener task delivers received messages to local members
+    - Subscribes when a room gets its first local member and
+      unsubscribes when its last one leaves (both under one lock, so a
+      join can't race the unsubscribe of the room it joins)
+    
+    Published data is "{sender}<newline>{json}": sender is "{node}:{id}" of an
+    excluded socket (or empty), so the sender's own worker can skip it.
+    """
+    
+    CHANNEL_PREFIX = "events:room:"
+    # Reconnect backoff after losing Redis (seconds, doubled per failure)
+    RECONNECT_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+    
+    def __init__(self, url: str):
+        super().__init__()
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self._listener: Optional[asyncio.Task] = None
+        # Serializes room membership changes with (un)subscribe calls
+        self._rooms_lock = asyncio.Lock()
+        # This worker's id, and its excluded senders by id()
+        # (weak: entries vanish with the socket)
+        self.node_id = uuid.uuid4().hex
+        self._senders = weakref.WeakValueDictionary()
+    
+    async def join_room(self, room: str, websocket: WebSocket):
+        """Add connection to a room, subscribing on first local member"""
+        async with self._rooms_lock:
+            first = room not in self.rooms
+            await super().join_room(room, websocket)
+            if first:
+                await self.pubsub.subscribe(self.CHANNEL_PREFIX + room)
+                # listen() returns once nothing is subscribed; restart it
+                if self._listener is None or self._listener.done():
+                    self._listener = asyncio.create_task(self._listen())
+    
+    async def leave_room(self, room: str, websocket: WebSocket):
+        """Remove connection from a room, unsubscribing on last local member"""
+        async with self._rooms_lock:
+            await super().leave_room(room, websocket)
+            if room not in self.rooms:
+                # Redis down: the reconnect only re-subscribes self.rooms
+                with suppress(aioredis.ConnectionError, aioredis.TimeoutError):
+                    await self.pubsub.unsubscribe(self.CHANNEL_PREFIX + room)
+    
+    async def broadcast_to_room(
+        self,
+        room: str,
+        message: str,
+        exclude: Optional[WebSocket] = None
+    ):
+        """Publish to every worker that has members in the room"""
+        sender = ""
+        if exclude is not None:
+            self._senders[id(exclude)] = exclude
+            sender = f"{self.node_id}:{id(exclude)}"
+        # orjson output never contains a raw newline
+        await self.redis.publish(self.CHANNEL_PREFIX + room, f"{sender}\n{message}")
+    
+    async def _listen(self):
+        """
+        Deliver published room messages to local members
+        
+        A message that fails to deliver (e.g. a malformed payload) is
+        logged and skipped. If the Redis connection drops, or anything
+        else breaks the listener, reconnect with backoff and re-subscribe
+        every room that still has local members.
+        Returns once nothing is subscribed any more.
+        """
+        delay = self.RECONNECT_DELAY
+        reconnect = False
+        while True:
+            try:
+                if reconnect:
+                    await self._resubscribe()
+                    delay = self.RECONNECT_DELAY
+                async for message in self.pubsub.listen():
+                    try:
+                        await self._deliver(message)
+                    except Exception:
+                        logger.exception("Dropping pub/sub message on %s", message.get("channel"))
+                return
+            except (aioredis.ConnectionError, aioredis.TimeoutError) as exc:
+                logger.warning("Redis pub/sub lost (%s), retrying in %.1fs", exc, delay)
+            except Exception:
+                logger.exception("Redis pub/sub listener failed, retrying in %.1fs", delay)
+            reconnect = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+    
+    async def _resubscribe(self):
+        """Replace the broken PubSub and subscribe the local rooms again"""
+        with suppress(aioredis.ConnectionError, aioredis.TimeoutError):
+            await self.pubsub.aclose()
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        if self.rooms:
+            await self.pubsub.subscribe(
+                *(self.CHANNEL_PREFIX + room for room in self.rooms)
+            )
+    
+    async def _deliver(self, message: dict):
+        """Fan one published message out to the room's local members"""
+        room = message["channel"][len(self.CHANNEL_PREFIX):]
+        # Room may have emptied while the message was in flight
+        if room not in self.rooms:
+            return
+        sender, _, data = message["data"].partition("\n")
+        node, _, sender_id = sender.partition(":")
+        exclude = self._senders.get(int(sender_id)) if node == self.node_id else None
+        # Local delivery: the in-process manager's fan-out
+        await super().broadcast_to_room(room, data, exclude)
+    
+    async def close(self):
+        """Stop the listener and close Redis connections"""
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+        await self.pubsub.aclose()
+        await self.redis.aclose()
+
+
+# ============================================================
+# Timestamps
+# ============================================================
+# A burst of messages in the same event-loop tick shares one
+# datetime instead of building a new one per message.
+
+_NOW_RESOLUTION = 0.001  # seconds of loop time
+_now_at = float("-inf")
+_now_value = datetime.now()
+
+
+def now() -> datetime:
+    """datetime.now(), cached for ~1ms of event-loop time"""
+    global _now_at, _now_value
+    t = asyncio.get_running_loop().time()
+    if t - _now_at > _NOW_RESOLUTION:
+        _now_at = t
+        _now_value = datetime.now()
+    return _now_value
 
 
 # Create global connection manager
-manager = ConnectionManager()
+# (set REDIS_URL to share rooms across workers)
+REDIS_URL = os.getenv("REDIS_URL")
+manager = RedisConnectionManager(REDIS_URL) if REDIS_URL else ConnectionManager()
 
 
 # ============================================================
@@ -161,7 +479,7 @@ async def websocket_endpoint(websocket: WebSocket):
 # CONCEPT 3: WebSocket with Path Parameter
 # ============================================================
 
-@app.websocket("/ws/{client_id}")
+@app.websocket("/ws/{client_id:int}")
 async def websocket_with_client_id(websocket: WebSocket, client_id: int):
     """
     WebSocket endpoint with path parameter
@@ -190,11 +508,23 @@ async def websocket_with_client_id(websocket: WebSocket, client_id: int):
 # CONCEPT 4: Chat Room WebSocket
 # ============================================================
 
+# Join/leave announcements differ only in username, room and time,
+# so they are filled into pre-built JSON instead of encoding a dict
+_JOIN_TEMPLATE = '{"type":"system","message":"%s joined the room","room":"%s","timestamp":"%s"}'
+_LEAVE_TEMPLATE = '{"type":"system","message":"%s left the room","room":"%s","timestamp":"%s"}'
+
+
+def json_escape(value: str) -> str:
+    """Escape a str for use inside a JSON string literal"""
+    return orjson.dumps(value).decode()[1:-1]
+
+
 @app.websocket("/ws/chat/{room}/{username}")
 async def chat_room(
     websocket: WebSocket,
     room: str,
-    username: str
+    username: str,
+    proto: Proto = Query(default="json")
 ):
     """
     Chat room WebSocket
@@ -205,61 +535,67 @@ async def chat_room(
     
     URL: ws://localhost:8000/ws/chat/{room}/{username}
     Example: ws://localhost:8000/ws/chat/general/john
+    Add ?proto=msgpack for binary msgpack frames
     """
-    await manager.connect(websocket)
+    await manager.connect(websocket, proto)
     await manager.join_room(room, websocket)
     manager.register_user(username, websocket)
     
     # Announce join
-    join_message = json.dumps({
-        "type": "system",
-        "message": f"{username} joined the room",
-        "room": room,
-        "timestamp": datetime.now().isoformat()
-    })
-    await manager.broadcast_to_room(room, join_message)
+    escaped = (json_escape(username), json_escape(room))
+    await manager.broadcast_to_room(
+        room, _JOIN_TEMPLATE % (*escaped, now().isoformat())
+    )
+    
+    # msgpack frames arrive already decoded
+    frames = manager.iter_json(websocket) if proto == "msgpack" else websocket.iter_text()
     
+    # The iterator ends the loop on disconnect (no except needed)
     try:
-        while True:
-            data = await websocket.receive_text()
-            
+        async for data in frames:
             # Parse incoming message
-            try:
-                incoming = json.loads(data)
-                message_text = incoming.get("message", data)
-            except json.JSONDecodeError:
+            if not isinstance(data, str):
+                # Same fallback as JSON: no "message" key -> the raw data
+                message_text = data.get("message", data) if isinstance(data, dict) else data
+            else:
                 message_text = data
+                # Only a JSON object can carry {"message": ...}; plain
+                # text skips the parse (and its exception) entirely
+                if data[:1] == "{":
+                    try:
+                        message_text = orjson.loads(data).get("message", data)
+                    except orjson.JSONDecodeError:
+                        pass
             
             # Create chat message
-            chat_message = json.dumps({
+            # (not echoed to the sender; join/leave still are)
+            await manager.broadcast_json({
                 "type": "message",
                 "username": username,
                 "message": message_text,
                 "room": room,
-                "timestamp": datetime.now().isoformat()
-            })
+                "timestamp": now()
+            }, room=room, exclude=websocket)
             
-            await manager.broadcast_to_room(room, chat_message)
-            
-    except WebSocketDisconnect:
+    finally:
         manager.disconnect(websocket)
-        manager.leave_room(room, websocket)
+        await manager.leave_room(room, websocket)
         manager.unregister_user(username)
         
         # Announce leave
-        leave_message = json.dumps({
-            "type": "system",
-            "message": f"{username} left the room",
-            "room": room,
-            "timestamp": datetime.now().isoformat()
-        })
-        await manager.broadcast_to_room(room, leave_message)
+        await manager.broadcast_to_room(
+            room, _LEAVE_TEMPLATE % (*escaped, now().isoformat())
+        )
 
 
 # ============================================================
 # CONCEPT 5: WebSocket with Query Parameters
 # ============================================================
 
+# Demo token (bytes: compared with hmac.compare_digest)
+WS_AUTH_TOKEN = b"secret-token"
+
+
 @app.websocket("/ws/auth")
 async def websocket_with_auth(
     websocket: WebSocket,
@@ -272,8 +608,10 @@ async def websocket_with_auth(
     
     In production, validate JWT token here
     """
-    # Validate token
-    if token != "secret-token":
+    # Validate token BEFORE accepting: close() on an unaccepted
+    # socket rejects the handshake instead of upgrading first.
+    # compare_digest takes the same time wherever the mismatch is.
+    if not token or not hmac.compare_digest(token.encode(), WS_AUTH_TOKEN):
         await websocket.close(code=4001, reason="Invalid token")
         return
     
@@ -281,11 +619,10 @@ async def websocket_with_auth(
     await manager.send_personal_message("Authenticated successfully!", websocket)
     
     try:
-        while True:
-            data = await websocket.receive_text()
+        async for data in websocket.iter_text():
             await manager.send_personal_message(f"Secure message: {data}", websocket)
             
-    except WebSocketDisconnect:
+    finally:
         manager.disconnect(websocket)
 
 
@@ -293,69 +630,88 @@ async def websocket_with_auth(
 # CONCEPT 6: JSON Message Protocol
 # ============================================================
 
+# One handler per action: dict lookup instead of an if/elif chain.
+# Each gets the socket, the decoded message and the client's channels.
+
+async def _on_subscribe(websocket: WebSocket, data: dict, subscribed_channels: Set[str]):
+    channel = data.get("channel")
+    if channel:
+        subscribed_channels.add(channel)
+        await manager.join_room(channel, websocket)
+        await manager.send_json({
+            "type": "subscribed",
+            "channel": channel
+        }, websocket)
+
+
+async def _on_unsubscribe(websocket: WebSocket, data: dict, subscribed_channels: Set[str]):
+    channel = data.get("channel")
+    if channel in subscribed_channels:
+        subscribed_channels.remove(channel)
+        await manager.leave_room(channel, websocket)
+        await manager.send_json({
+            "type": "unsubscribed",
+            "channel": channel
+        }, websocket)
+
+
+async def _on_send(websocket: WebSocket, data: dict, subscribed_channels: Set[str]):
+    channel = data.get("channel")
+    message = data.get("message")
+    if channel and message:
+        await manager.broadcast_json({
+            "type": "message",
+            "channel": channel,
+            "message": message,
+            "timestamp": now()
+        }, room=channel)
+
+
+async def _on_ping(websocket: WebSocket, data: dict, subscribed_channels: Set[str]):
+    await manager.send_json({"type": "pong"}, websocket)
+
+
+async def _on_unknown(websocket: WebSocket, data: dict, subscribed_channels: Set[str]):
+    await manager.send_json({
+        "type": "error",
+        "message": f"Unknown action: {data.get('action')}"
+    }, websocket)
+
+
+JSON_ACTIONS = {
+    "subscribe": _on_subscribe,
+    "unsubscribe": _on_unsubscribe,
+    "send": _on_send,
+    "ping": _on_ping,
+}
+
+
 @app.websocket("/ws/json")
-async def json_websocket(websocket: WebSocket):
+async def json_websocket(
+    websocket: WebSocket,
+    proto: Proto = Query(default="json")
+):
     """
     WebSocket with JSON message protocol
     
     Expects messages like:
     {"action": "subscribe", "channel": "news"}
     {"action": "send", "channel": "news", "message": "Hello"}
+    
+    Same messages as msgpack maps with ?proto=msgpack
     """
-    await manager.connect(websocket)
-    subscribed_channels: List[str] = []
+    await manager.connect(websocket, proto)
+    subscribed_channels: Set[str] = set()
     
     try:
-        while True:
-            data = await websocket.receive_json()
-            
-            action = data.get("action")
-            
-            if action == "subscribe":
-                channel = data.get("channel")
-                if channel:
-                    subscribed_channels.append(channel)
-                    await manager.join_room(channel, websocket)
-                    await websocket.send_json({
-                        "type": "subscribed",
-                        "channel": channel
-                    })
-            
-            elif action == "unsubscribe":
-                channel = data.get("channel")
-                if channel in subscribed_channels:
-                    subscribed_channels.remove(channel)
-                    manager.leave_room(channel, websocket)
-                    await websocket.send_json({
-                        "type": "unsubscribed",
-                        "channel": channel
-                    })
-            
-            elif action == "send":
-                channel = data.get("channel")
-                message = data.get("message")
-                if channel and message:
-                    broadcast_msg = json.dumps({
-                        "type": "message",
-                        "channel": channel,
-                        "message": message,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    await manager.broadcast_to_room(channel, broadcast_msg)
-            
-            elif action == "ping":
-                await websocket.send_json({"type": "pong"})
-            
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": f"Unknown action: {action}"
-                })
+        async for data in manager.iter_json(websocket):
+            handler = JSON_ACTIONS.get(data.get("action"), _on_unknown)
+            await handler(websocket, data, subscribed_channels)
                 
-    except WebSocketDisconnect:
+    finally:
         manager.disconnect(websocket)
         for channel in subscribed_channels:
-            manager.leave_room(channel, websocket)
+            await manager.leave_room(channel, websocket)
 
 
 # ============================================================
@@ -368,27 +724,54 @@ tasks = {
     2: {"id": 2, "title": "Task 2", "status": "in_progress"},
 }
 
+# O(1) id allocation instead of max(tasks.keys()) + 1 per create
+_next_task_id = itertools.count(max(tasks, default=0) + 1)
+
+# One lock per task: an update and the copy that gets broadcast are
+# taken together; updates to different tasks don't wait
+_task_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Encoded "initial" message per proto, shared by every new client
+# (cleared whenever tasks change)
+_snapshot_cache: Dict[str, object] = {}
+
+
+def tasks_snapshot(proto: Proto):
+    """The "initial" message, encoded once until tasks change"""
+    encoded = _snapshot_cache.get(proto)
+    if encoded is None:
+        payload = {"type": "initial", "tasks": list(tasks.values())}
+        if proto == "msgpack":
+            encoded = msgpack.packb(payload)
+        else:
+            encoded = orjson.dumps(payload).decode()
+        _snapshot_cache[proto] = encoded
+    return encoded
+
 
 @app.websocket("/ws/tasks")
-async def task_updates(websocket: WebSocket):
+async def task_updates(
+    websocket: WebSocket,
+    proto: Proto = Query(default="json")
+):
     """
     Real-time task updates
     
     Clients receive updates when tasks change
+    (?proto=msgpack for binary msgpack frames)
     """
-    await manager.connect(websocket)
+    await manager.connect(websocket, proto)
     await manager.join_room("tasks", websocket)
     
     # Send current tasks on connect
-    await websocket.send_json({
-        "type": "initial",
-        "tasks": list(tasks.values())
-    })
+    snapshot = tasks_snapshot(proto)
+    if proto == "msgpack":
+        await websocket.send_bytes(snapshot)
+    else:
+        await websocket.send_text(snapshot)
     
     try:
-        while True:
-            data = await websocket.receive_json()
-            
+        async for data in manager.iter_json(websocket):
             action = data.get("action")
             
             if action == "update_status":
@@ -396,42 +779,45 @@ async def task_updates(websocket: WebSocket):
                 new_status = data.get("status")
                 
                 if task_id in tasks:
-                    tasks[task_id]["status"] = new_status
+                    # Snapshot under the lock, broadcast after releasing it:
+                    # a slow fan-out must not hold up the next update
+                    async with _task_locks[task_id]:
+                        tasks[task_id]["status"] = new_status
+                        _snapshot_cache.clear()
+                        task = dict(tasks[task_id])
                     
                     # Broadcast update to all clients
-                    update_msg = json.dumps({
+                    await manager.broadcast_json({
                         "type": "task_updated",
-                        "task": tasks[task_id]
-                    })
-                    await manager.broadcast_to_room("tasks", update_msg)
+                        "task": task
+                    }, room="tasks")
             
             elif action == "create":
-                new_id = max(tasks.keys()) + 1
+                new_id = next(_next_task_id)
                 tasks[new_id] = {
                     "id": new_id,
                     "title": data.get("title", f"Task {new_id}"),
                     "status": "pending"
                 }
+                _snapshot_cache.clear()
                 
-                create_msg = json.dumps({
+                await manager.broadcast_json({
                     "type": "task_created",
                     "task": tasks[new_id]
-                })
-                await manager.broadcast_to_room("tasks", create_msg)
+                }, room="tasks")
                 
-    except WebSocketDisconnect:
+    finally:
         manager.disconnect(websocket)
-        manager.leave_room("tasks", websocket)
+        await manager.leave_room("tasks", websocket)
 
 
 # ============================================================
 # HTML Test Page
 # ============================================================
 
-@app.get("/", response_class=HTMLResponse)
-async def get_test_page():
-    """HTML page for testing WebSockets"""
-    return """
+# Test page, encoded once at import: GET / serves the same bytes
+# (with a precomputed Content-Length) instead of re-encoding a str
+TEST_PAGE_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -579,6 +965,9 @@ async def get_test_page():
             const input = document.getElementById("chatInput");
             if (chatWs && input.value) {
                 chatWs.send(JSON.stringify({message: input.value}));
+                // The server doesn't echo our own messages back
+                const username = document.getElementById("username").value;
+                addChatMessage(`${username}: ${input.value}`, "message");
                 input.value = "";
             }
         }
@@ -603,6 +992,14 @@ async def get_test_page():
 </body>
 </html>
     """
+_TEST_PAGE = TEST_PAGE_HTML.encode("utf-8")
+_TEST_PAGE_HEADERS = {"content-length": str(len(_TEST_PAGE))}
+
+
+@app.get("/", response_class=HTMLResponse)
+async def get_test_page():
+    """HTML page for testing WebSockets"""
+    return HTMLResponse(content=_TEST_PAGE, headers=_TEST_PAGE_HEADERS)
 
 
 @app.get("/info")
@@ -628,3 +1025,24 @@ def info():
         },
         "test_page": "http://localhost:8000/"
     }
+
+
+# ============================================================
+# Run with uvloop + httptools
+# ============================================================
+# Both ship with uvicorn[standard]: libuv event loop and C HTTP parser.
+# (uvloop is not available on Windows; use plain `uvicorn main:app` there)
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",       # Cython/libuv event loop
+        http="httptools",    # C HTTP parser
+        ws="websockets",     # WebSocket protocol implementation
+        workers=1,
+        log_level="info"
+    )
@@ -15,13 +15,14 @@ Concepts Covered:
 
 Run Command:
     uvicorn main:app --reload
+    python main.py                # uvloop + httptools, no reload
 
 Watch the console for startup/shutdown messages!
 """
 
 from fastapi import FastAPI, Depends, HTTPException
 from contextlib import asynccontextmanager
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 import asyncio
 import logging
@@ -50,10 +51,12 @@ class AppState:
     
     def __init__(self):
         self.db_pool: Optional[Any] = None
+        self.cache_client: Optional[Any] = None
         self.cache: Dict[str, Any] = {}
         self.config: Dict[str, Any] = {}
         self.startup_time: Optional[datetime] = None
-        self.background_tasks: List[asyncio.Task] = []
+        self.background_task: Optional[asyncio.Task] = None
+        self.stop_event: Optional[asyncio.Event] = None
         self.is_ready: bool = False
 
 
@@ -140,6 +143,27 @@ class FakeCache:
 # CONCEPT 3: Background Task
 # ============================================================
 
+async def ticks(interval: float):
+    """
+    Yield every `interval` seconds (first tick right away) until shutdown
+    
+    - Deadlines advance from the start time, so the schedule doesn't drift
+    - Waits on app_state.stop_event, so shutdown ends the wait at once
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    while not app_state.stop_event.is_set():
+        yield
+        deadline += interval
+        try:
+            await asyncio.wait_for(
+                app_state.stop_event.wait(),
+                timeout=max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
 async def periodic_cleanup_task():
     """
     Background task that runs periodically
@@ -150,25 +174,63 @@ async def periodic_cleanup_task():
     - Update statistics
     - Health checks
     """
-    while True:
-        try:
+    try:
+        async for _ in ticks(60):  # Run every 60 seconds
             logger.info("🧹 Running periodic cleanup...")
-            await asyncio.sleep(60)  # Run every 60 seconds
-        except asyncio.CancelledError:
-            logger.info("🧹 Cleanup task cancelled")
-            break
+    except asyncio.CancelledError:
+        pass  # Fallback if stop_event didn't end it in time
+    logger.info("🧹 Cleanup task stopped")
 
 
 async def metrics_collector_task():
     """Collect and log metrics periodically"""
-    while True:
-        try:
+    try:
+        async for _ in ticks(30):
             logger.info("📈 Collecting metrics...")
             # Simulate metrics collection
-            await asyncio.sleep(30)
-        except asyncio.CancelledError:
-            logger.info("📈 Metrics collector stopped")
-            break
+    except asyncio.CancelledError:
+        pass
+    logger.info("📈 Metrics collector stopped")
+
+
+BACKGROUND_JOBS = (periodic_cleanup_task, metrics_collector_task)
+
+# Seconds to let jobs finish after stop_event before cancelling them
+JOBS_STOP_TIMEOUT = 5
+
+
+async def run_background_jobs():
+    """
+    Run every periodic job inside ONE task (a TaskGroup)
+    
+    Cancelling this task cancels every job: one cancel + one await at
+    shutdown instead of one per job. If a job raises, the TaskGroup
+    cancels the others too, so no job is left running on its own.
+    """
+    async with asyncio.TaskGroup() as group:
+        for job in BACKGROUND_JOBS:
+            group.create_task(job())
+
+
+def background_jobs_status() -> Dict[str, Any]:
+    """
+    Jobs actually running, and why they stopped if they crashed
+    
+    A finished task (crash, cancel, early return) runs no jobs,
+    even though app_state still holds it: the TaskGroup only finishes
+    once every job has stopped.
+    """
+    task = app_state.background_task
+    if task is None:
+        return {"running": 0, "error": None}
+    if not task.done():
+        return {"running": len(BACKGROUND_JOBS), "error": None}
+    error = None if task.cancelled() else task.exception()
+    if error is None:
+        return {"running": 0, "error": None}
+    # TaskGroup wraps job failures in an ExceptionGroup: report the jobs' own
+    errors = error.exceptions if isinstance(error, BaseExceptionGroup) else (error,)
+    return {"running": 0, "error": "; ".join(map(repr, errors))}
 
 
 # ============================================================
@@ -219,13 +281,13 @@ async def lifespan(app: FastAPI):
     cache = FakeCache()
     await cache.connect()
     await cache.warm_cache()
+    app_state.cache_client = cache
     app_state.cache = cache.data
     
     # 4. Start background tasks
     logger.info("⏰ Starting background tasks...")
-    cleanup_task = asyncio.create_task(periodic_cleanup_task())
-    metrics_task = asyncio.create_task(metrics_collector_task())
-    app_state.background_tasks = [cleanup_task, metrics_task]
+    app_state.stop_event = asyncio.Event()  # created on the running loop
+    app_state.background_task = asyncio.create_task(run_background_jobs())
     logger.info("✅ Background tasks started!")
     
     # 5. Mark as ready
@@ -244,16 +306,19 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 APPLICATION SHUTTING DOWN...")
     logger.info("=" * 50)
     
-    # 1. Cancel background tasks
-    logger.info("⏰ Cancelling background tasks...")
-    for task in app_state.background_tasks:
+    # 1. Stop background tasks (cancel only as a fallback)
+    logger.info("⏰ Stopping background tasks...")
+    app_state.stop_event.set()
+    _, pending = await asyncio.wait(
+        {app_state.background_task}, timeout=JOBS_STOP_TIMEOUT
+    )
+    for task in pending:
         task.cancel()
-    await asyncio.gather(*app_state.background_tasks, return_exceptions=True)
-    logger.info("✅ Background tasks cancelled!")
+    await asyncio.gather(app_state.background_task, return_exceptions=True)
+    logger.info("✅ Background tasks stopped!")
     
-    # 2. Close cache
-    cache = FakeCache()  # Get reference
-    await cache.disconnect()
+    # 2. Close cache (the client created at startup)
+    await app_state.cache_client.disconnect()
     
     # 3. Close database
     await app_state.db_pool.disconnect()
@@ -334,13 +399,22 @@ def health():
     Checks if all resources are ready
     """
     db_ready = app_state.db_pool and app_state.db_pool.is_connected()
+    jobs = background_jobs_status()
+    
+    if not app_state.is_ready:
+        status = "unhealthy"
+    elif jobs["running"] < len(BACKGROUND_JOBS):
+        status = "degraded"  # serving requests, but the jobs are dead
+    else:
+        status = "healthy"
     
     return {
-        "status": "healthy" if app_state.is_ready else "unhealthy",
+        "status": status,
         "checks": {
             "database": "connected" if db_ready else "disconnected",
             "cache": "loaded" if app_state.cache else "empty",
-            "background_tasks": len(app_state.background_tasks)
+            "background_tasks": jobs["running"],
+            "background_error": jobs["error"]
         },
         "uptime_seconds": (datetime.now() - app_state.startup_time).total_seconds() if app_state.startup_time else 0
     }
@@ -406,7 +480,7 @@ def status():
         "resources": {
             "database": "connected" if app_state.db_pool and app_state.db_pool.is_connected() else "disconnected",
             "cache_items": len(app_state.cache) if app_state.cache else 0,
-            "background_tasks": len(app_state.background_tasks)
+            "background_tasks": background_jobs_status()
         }
     }
 
@@ -461,3 +535,24 @@ This still works but lifespan is preferred because:
 3. More Pythonic
 4. Easier testing
 """
+
+
+# ============================================================
+# Run with uvloop + httptools
+# ============================================================
+# The event loop must be chosen BEFORE it starts: lifespan already
+# runs inside the loop, so uvloop is selected here, not in lifespan.
+# (uvloop is not available on Windows; use plain `uvicorn main:app` there)
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",       # Cython/libuv event loop
+        http="httptools",    # C HTTP parser
+        workers=1,
+        log_level="info"
+    )
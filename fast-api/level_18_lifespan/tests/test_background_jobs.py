@@ -0,0 +1,80 @@
+"""
+Test Background Jobs
+====================
+One failing job must not leave its siblings running, and
+background_jobs_status() must report what is really running.
+
+Run: pytest tests/test_background_jobs.py -v
+"""
+
+import asyncio
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """
+    Replace the real jobs with one that crashes and one that runs forever
+
+    Returns the list of events recorded by the long-running job.
+    """
+    events = []
+
+    async def failing_job():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def long_job():
+        try:
+            events.append("started")
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    monkeypatch.setattr(main, "BACKGROUND_JOBS", (failing_job, long_job))
+    monkeypatch.setattr(main.app_state, "background_task", None)
+    return events
+
+
+class TestBackgroundJobs:
+    """Tests for run_background_jobs() and background_jobs_status()"""
+
+    def test_failing_job_cancels_the_others(self, jobs):
+        """
+        Test that when one job raises, the other job is cancelled
+
+        1. Start both jobs in one task
+        2. The failing job raises
+        3. The long-running job gets cancelled, nothing is left pending
+        """
+        async def scenario():
+            main.app_state.background_task = asyncio.create_task(main.run_background_jobs())
+            with pytest.raises(ExceptionGroup):
+                await main.app_state.background_task
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+        pending = asyncio.run(scenario())
+
+        assert jobs == ["started", "cancelled"]
+        assert pending == []
+
+    def test_status_reports_the_failure(self, jobs):
+        """
+        Test that status reports 2 running jobs, then 0 and the job's own error
+        """
+        async def scenario():
+            main.app_state.background_task = asyncio.create_task(main.run_background_jobs())
+            await asyncio.sleep(0)
+            running = main.background_jobs_status()
+            with pytest.raises(ExceptionGroup):
+                await main.app_state.background_task
+            return running, main.background_jobs_status()
+
+        running, stopped = asyncio.run(scenario())
+
+        assert running == {"running": 2, "error": None}
+        assert stopped == {"running": 0, "error": "RuntimeError('boom')"}
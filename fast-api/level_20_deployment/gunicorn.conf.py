@@ -7,37 +7,107 @@ Gunicorn is a production WSGI server.
 We use uvicorn workers to run FastAPI (ASGI).
 """
 
+import gc
+import json
+import logging
 import os
-import multiprocessing
+import signal
+import sys
+
+from gunicorn.glogging import Logger
+from uvicorn.workers import UvicornWorker
+
+# server_settings.py sits next to this file (gunicorn doesn't put
+# the config's directory on sys.path before loading it)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import server_settings as server  # noqa: E402
+
+# Gunicorn's own error logger: honours loglevel/errorlog below
+log = logging.getLogger("gunicorn.error")
 
 # ============================================================
 # Server Socket
 # ============================================================
 
 # Bind address
-bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+bind = f"{server.HOST}:{server.PORT}"
 
 # Backlog - number of pending connections
-backlog = 2048
+backlog = server.BACKLOG
 
 
 # ============================================================
 # Worker Processes
 # ============================================================
 
+class AppUvicornWorker(UvicornWorker):
+    """UvicornWorker pinned to uvloop + httptools, with a connection cap
+
+    UvicornWorker ignores UVICORN_* env vars and only forwards a few
+    gunicorn settings, so uvicorn-only options go in CONFIG_KWARGS.
+    The default loop="auto"/http="auto" silently falls back to asyncio
+    + h11 when uvicorn[standard] is missing; naming them fails loudly.
+    Above limit_concurrency the worker answers 503 right away instead
+    of queueing requests until memory runs out or `timeout` kills it.
+    """
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "limit_concurrency": server.LIMIT_CONCURRENCY,
+    }
+
+    async def callback_notify(self):
+        """Heartbeat (every timeout / 2): also the memory watchdog"""
+        await super().callback_notify()
+        if not MAX_WORKER_RSS_MB:
+            return
+        rss = worker_rss_mb()
+        if rss is not None and rss > MAX_WORKER_RSS_MB:
+            if not getattr(self, "recycling", False):
+                self.recycling = True
+                log.warning(
+                    "Worker %d above %d MB RSS, restarting",
+                    os.getpid(), MAX_WORKER_RSS_MB,
+                )
+                # Graceful: uvicorn finishes in-flight requests, then
+                # the master spawns a replacement
+                os.kill(os.getpid(), signal.SIGTERM)
+
+
+def worker_rss_mb():
+    """Current resident memory of this process in MB, None if unknown
+
+    Only /proc (Linux) gives the *current* RSS; getrusage() reports the
+    peak, which never goes down, so without /proc the watchdog is off.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
 # Worker class - use uvicorn for ASGI
-worker_class = "uvicorn.workers.UvicornWorker"
+# WORKER_CLASS overrides it, e.g. "uvicorn.workers.UvicornWorker"
+worker_class = os.getenv("WORKER_CLASS") or AppUvicornWorker
 
-# Number of workers
-# Rule of thumb: (2 x CPU cores) + 1
-workers = int(os.getenv("WORKERS", multiprocessing.cpu_count() * 2 + 1))
 
-# Threads per worker (for sync workers, not used with uvicorn)
-threads = 1
+# Number of workers: one per usable core (+1), see server_settings.py
+workers = server.WORKERS
 
-# Maximum requests per worker before restart (prevents memory leaks)
-max_requests = 1000
-max_requests_jitter = 50  # Random jitter to prevent all workers restarting at once
+# Maximum requests per worker before restart (0 = never)
+# Every restart drops the worker's keep-alive connections and pays a
+# cold start, so it is off by default; set MAX_REQUESTS only for an
+# app with a known leak. MAX_WORKER_RSS_MB restarts a worker only
+# when it actually grows too big (checked on every heartbeat, Linux only).
+max_requests = int(os.getenv("MAX_REQUESTS", 0))
+# Random jitter to prevent all workers restarting at once
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", 0))
+MAX_WORKER_RSS_MB = int(os.getenv("MAX_WORKER_RSS_MB", 0))
 
 
 # ============================================================
@@ -45,13 +115,17 @@ max_requests_jitter = 50  # Random jitter to prevent all workers restarting at o
 # ============================================================
 
 # Worker timeout (seconds)
+# For UvicornWorker this is a heartbeat from the event loop, not a
+# per-request limit: long-lived WebSockets are NOT killed by it, only
+# a worker whose loop is blocked for this long
 timeout = 30
 
 # Graceful timeout for workers to finish requests
-graceful_timeout = 30
+graceful_timeout = server.GRACEFUL_TIMEOUT
 
-# Keep-alive timeout
-keepalive = 5
+# Keep-alive timeout: must exceed the load balancer's idle timeout
+# (see server_settings.py)
+keepalive = server.KEEPALIVE
 
 
 # ============================================================
@@ -61,6 +135,13 @@ keepalive = 5
 # Daemonize the process (run in background)
 daemon = False
 
+# Import the app once in the master; workers are forked from it and
+# share the already-imported modules (copy-on-write) instead of each
+# re-importing them. Lifespan startup still runs inside every worker,
+# so pools and background tasks created there stay per worker.
+# Note: code changes then need a full restart (HUP reloads no code).
+preload_app = True
+
 # PID file
 pidfile = None  # "/var/run/gunicorn.pid" for production
 
@@ -82,20 +163,54 @@ tmp_upload_dir = None
 # Logging
 # ============================================================
 
-# Access log
-accesslog = "-"  # "-" means stdout, or "/var/log/gunicorn/access.log"
+# Access log: "-" means stdout, or ACCESS_LOG=/var/log/gunicorn/access.log
+accesslog = os.getenv("ACCESS_LOG", "-")
 
 # Error log
 errorlog = "-"   # "-" means stderr, or "/var/log/gunicorn/error.log"
 
 # Log level
-loglevel = os.getenv("LOG_LEVEL", "info").lower()
+loglevel = server.LOG_LEVEL
+
+# Access log format: one JSON object per line (NDJSON), ready for
+# log shippers (fluent-bit, vector) without regex parsing.
+# Note: access_log_format does nothing for uvicorn workers - they log
+# through the "uvicorn.access" logger using gunicorn's access handlers,
+# so the format is set on those handlers instead.
 
-# Access log format
-access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
-# Capture stdout/stderr from workers
-capture_output = True
+class JsonAccessFormatter(logging.Formatter):
+    """Formats uvicorn access records as JSON"""
+
+    def format(self, record):
+        if isinstance(record.args, tuple) and len(record.args) == 5:
+            client, method, path, http_version, status = record.args
+            entry = {
+                "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+                "client": client,
+                "method": method,
+                "path": path,
+                "http_version": http_version,
+                "status": status,
+            }
+        else:
+            entry = {
+                "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+                "message": record.getMessage(),
+            }
+        return json.dumps(entry, separators=(",", ":"))
+
+
+class JsonLogger(Logger):
+    """Gunicorn logger whose access log writes JSON lines"""
+
+    def setup(self, cfg):
+        super().setup(cfg)
+        for handler in self.access_log.handlers:
+            handler.setFormatter(JsonAccessFormatter())
+
+
+logger_class = JsonLogger
 
 # Enable access log
 enable_stdio_inheritance = True
@@ -114,36 +229,37 @@ proc_name = os.getenv("APP_NAME", "fastapi-app")
 
 def on_starting(server):
     """Called just before the master process is initialized."""
-    print("=" * 50)
-    print("Starting Gunicorn server...")
-    print(f"Workers: {workers}")
-    print(f"Bind: {bind}")
-    print("=" * 50)
+    log.info("Starting Gunicorn server: %d workers on %s", workers, bind)
 
 
 def on_reload(server):
     """Called before reloading the configuration."""
-    print("Reloading configuration...")
+    log.info("Reloading configuration...")
 
 
 def worker_int(worker):
     """Called when a worker receives SIGINT or SIGQUIT."""
-    print(f"Worker {worker.pid} interrupted")
+    log.info("Worker %d interrupted", worker.pid)
 
 
 def worker_abort(worker):
     """Called when a worker receives SIGABRT."""
-    print(f"Worker {worker.pid} aborted")
+    log.warning("Worker %d aborted", worker.pid)
 
 
 def pre_fork(server, worker):
     """Called just before a worker is forked."""
-    pass
+    # Move the preloaded objects out of the GC's reach: collections in
+    # the worker would otherwise touch (and copy) every shared page
+    gc.freeze()
 
 
 def post_fork(server, worker):
     """Called just after a worker has been forked."""
-    print(f"Worker {worker.pid} spawned")
+    # With preload_app, anything that opened a socket at import time
+    # (HTTP/DB clients) is shared with the master: rebuild it here.
+    # app.main creates its clients in the lifespan, so nothing to do.
+    log.info("Worker %d spawned", worker.pid)
 
 
 def post_worker_init(worker):
@@ -153,17 +269,17 @@ def post_worker_init(worker):
 
 def worker_exit(server, worker):
     """Called just after a worker has been exited."""
-    print(f"Worker {worker.pid} exited")
+    log.info("Worker %d exited", worker.pid)
 
 
 def nworkers_changed(server, new_value, old_value):
     """Called when the number of workers changes."""
-    print(f"Workers changed from {old_value} to {new_value}")
+    log.info("Workers changed from %s to %s", old_value, new_value)
 
 
 def on_exit(server):
     """Called just before exiting Gunicorn."""
-    print("Shutting down Gunicorn server...")
+    log.info("Shutting down Gunicorn server...")
 
 
 # ============================================================
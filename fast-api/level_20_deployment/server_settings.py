@@ -0,0 +1,66 @@
+"""
+Server Sizing shared by gunicorn.conf.py and uvicorn_config.py
+==============================================================
+Plain module (no gunicorn/uvicorn imports) so both ways of running
+the app get the same workers, backlog and timeouts.
+"""
+
+import multiprocessing
+import os
+
+
+def available_cpus():
+    """CPUs this process may actually use (container-aware)
+
+    multiprocessing.cpu_count() reports the host's cores; inside a
+    container limited to 1 CPU on a 64-core node that means 64.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))  # cpuset (Linux only)
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+
+    # CPU quota (Kubernetes limits, docker --cpus): cgroup v2 "cpu.max"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+# Backlog - number of pending connections
+BACKLOG = 2048
+
+# Number of workers
+# (2 x CPU cores) + 1 is the rule for SYNC workers that block per request.
+# An async Uvicorn worker serves many connections on one event loop,
+# so one worker per core (+1) is enough.
+# WORKERS_PER_CORE scales that (e.g. 0.5 for memory-heavy apps)
+WORKERS_PER_CORE = float(os.getenv("WORKERS_PER_CORE", "1"))
+WORKERS = int(os.getenv(
+    "WORKERS",
+    os.getenv("WEB_CONCURRENCY", max(2, int(available_cpus() * WORKERS_PER_CORE) + 1))
+))
+
+# Per worker: beyond this many open connections/tasks -> 503
+LIMIT_CONCURRENCY = int(os.getenv("LIMIT_CONCURRENCY", "1000"))
+
+# Graceful timeout for workers to finish requests
+GRACEFUL_TIMEOUT = 30
+
+# Keep-alive timeout
+# Idle keep-alive connections stay open between requests (long-poll
+# clients, load balancers that reuse upstream connections).
+# Must be LONGER than the upstream idle timeout (AWS ALB 60s, GCP LB
+# and nginx keepalive_timeout 75s by default): if the server closes
+# first, the LB can reuse a connection that is being torn down -> 502
+KEEPALIVE = int(os.getenv("KEEPALIVE", 75))
+
+# Log level
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").lower()
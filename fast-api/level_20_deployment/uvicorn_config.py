@@ -0,0 +1,36 @@
+"""
+Uvicorn Configuration (without Gunicorn)
+========================================
+Run: python uvicorn_config.py
+
+Uvicorn's own process manager runs the workers: no Gunicorn master in
+front of them. It restarts workers that die, but has no graceful
+HUP reload - let the platform (Kubernetes, systemd) handle restarts
+and scaling.
+
+Worker count, keep-alive, backlog and log level come from
+server_settings.py, shared with gunicorn.conf.py, so both ways of
+running the app are sized the same.
+"""
+
+import uvicorn
+
+import server_settings as server
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "app.main:app",
+        host=server.HOST,
+        port=server.PORT,
+        workers=server.WORKERS,
+        # uvloop + httptools, as installed by uvicorn[standard]
+        loop="uvloop",
+        http="httptools",
+        backlog=server.BACKLOG,
+        timeout_keep_alive=server.KEEPALIVE,
+        limit_concurrency=server.LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=server.GRACEFUL_TIMEOUT,
+        log_level=server.LOG_LEVEL,
+        proxy_headers=True,
+    )
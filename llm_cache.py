@@ -0,0 +1,198 @@
+"""
+Response cache for LLM calls
+============================
+Two tiers, checked in order:
+    1. Exact: sha256 of (model, question) -> cached answer
+    2. Semantic: the question's embedding is compared (cosine) with
+       embeddings of cached questions; close enough -> reuse that answer
+
+Only cache deterministic calls (temperature == 0): with sampling, the
+"same" question is supposed to get different answers.
+
+The semantic scan is one matrix-vector product with numpy installed;
+without it, the pure-Python scan runs in a worker thread so it doesn't
+block the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import operator
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Protocol
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python scan in a thread instead
+    np = None
+
+
+class CacheBackend(Protocol):
+    """Where answers are stored (in-process dict, Redis, ...)"""
+
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+
+class MemoryBackend:
+    """In-process backend: bounded, oldest entry evicted first"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+def _normalize(vector):
+    if np is not None:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _scan(items, vector, threshold: float) -> List[str]:
+    """Keys whose vector scores >= threshold, most similar first"""
+    scored = []
+    for key, cached in items:
+        score = sum(map(operator.mul, vector, cached))
+        if score >= threshold:
+            scored.append((score, key))
+    scored.sort(reverse=True)
+    return [key for _, key in scored]
+
+
+class LLMCache:
+    """
+    Exact + semantic cache in front of an LLM call
+
+    Usage:
+        answer = await cache.get_or_compute(question, call_llm)
+
+    `embeddings` is any object with `aembed_query(text)` (e.g.
+    OpenAIEmbeddings); without it only the exact tier is used.
+    The vector index holds at most `max_vectors` entries (default: the
+    backend's `max_entries`) and forgets a vector once its answer has
+    expired or been evicted from the backend.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        backend: CacheBackend,
+        embeddings: Any = None,
+        threshold: float = 0.95,
+        ttl: float = 3600,
+        max_vectors: Optional[int] = None,
+    ):
+        self.model = model
+        self.backend = backend
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        if max_vectors is None:
+            max_vectors = getattr(backend, "max_entries", 1024)
+        self.max_vectors = max_vectors
+        # key -> unit vector of cached questions, oldest dropped first
+        self._vectors: "OrderedDict[str, Any]" = OrderedDict()
+        # numpy only: _vectors stacked into a matrix, rebuilt after changes
+        self._keys: List[str] = []
+        self._matrix = None
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def key(self, question: str) -> str:
+        """Exact-tier key"""
+        payload = json.dumps({"model": self.model, "question": question}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get_or_compute(
+        self, question: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Cached answer for question, or `await compute()` (and cache it)"""
+        key = self.key(question)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        vector = None
+        if self.embeddings is not None:
+            vector = _normalize(await self.embeddings.aembed_query(question))
+            value = await self._nearest(vector)
+            if value is not None:
+                self.hits += 1
+                self.semantic_hits += 1
+                return value
+
+        self.misses += 1
+        value = await compute()
+        await self.backend.set(key, value, self.ttl)
+        if vector is not None:
+            self._add_vector(key, vector)
+        return value
+
+    def _add_vector(self, key: str, vector) -> None:
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        while len(self._vectors) > self.max_vectors:
+            self._vectors.popitem(last=False)
+        self._matrix = None
+
+    def _drop_vector(self, key: str) -> None:
+        if self._vectors.pop(key, None) is not None:
+            self._matrix = None
+
+    async def _nearest(self, vector) -> Optional[Any]:
+        """Answer of the most similar cached question above threshold"""
+        for key in await self._candidates(vector):
+            value = await self.backend.get(key)
+            if value is not None:
+                return value
+            # Expired/evicted in the backend: stop matching it
+            self._drop_vector(key)
+        return None
+
+    async def _candidates(self, vector) -> List[str]:
+        """Keys above threshold, most similar first"""
+        if not self._vectors:
+            return []
+        if np is None:
+            # Snapshot: the index may change while the thread scans
+            items = tuple(self._vectors.items())
+            return await asyncio.to_thread(_scan, items, vector, self.threshold)
+        if self._matrix is None:
+            self._keys = list(self._vectors)
+            self._matrix = np.stack(list(self._vectors.values()))
+        scores = self._matrix @ vector
+        hits = np.flatnonzero(scores >= self.threshold)
+        hits = hits[np.argsort(-scores[hits])]
+        return [self._keys[i] for i in hits]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,40 +1,262 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
+import asyncio
+import bisect
+import os
+import time
+from contextlib import asynccontextmanager
 
+import httpx
+import orjson
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
-# Load API key from .env
-load_dotenv()
+from llm_cache import LLMCache, MemoryBackend
 
-# Initialize OpenAI model via LangChain
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.5,
-)
 
-# Create a prompt template
-prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are a helpful assistant."),
-    ("human", "{question}")
-])
+# Load API key from .env during development only: in production the
+# environment (Docker, Kubernetes secrets) provides it, and a stray
+# .env must not fill in what the deployment left unset
+if os.getenv("ENVIRONMENT", "development") == "development":
+    from dotenv import load_dotenv
+    load_dotenv()
 
-# Combine prompt + model
-chain = prompt | llm
+MODEL = "gpt-4o-mini"
+# Set LLM_TEMPERATURE=0 for deterministic answers (enables the cache)
+TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.5"))
+
+# HTTP/2 needs the optional h2 package: pip install "httpx[http2]"
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+def create_http_client():
+    """One pooled client for all OpenAI calls: connections (and their TLS
+    handshakes) are reused, and with HTTP/2 concurrent requests share one"""
+    return httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+
+
+# Created in the app lifespan (see below), on the running event loop,
+# and closed on shutdown: the pooled client and the OpenAI model using it
+http_client = None
+llm = None
+
+# The system message never changes: build it once and only create the
+# human message per request (no prompt template formatting per call)
+SYSTEM_MESSAGE = SystemMessage(content="You are a helpful assistant.")
+
+# At most LLM_INFLIGHT OpenAI calls at once per worker; when the API
+# slows down, extra requests get a fast 503 instead of piling up
+LLM_INFLIGHT = asyncio.Semaphore(int(os.getenv("LLM_INFLIGHT", "64")))
+
+# Response cache (exact + semantic match on the question)
+# Only deterministic answers are safe to reuse
+# Its embeddings share http_client, so the lifespan attaches them
+cache = None
+if TEMPERATURE == 0:
+    cache = LLMCache(
+        model=MODEL,
+        backend=MemoryBackend(),
+        threshold=float(os.getenv("CACHE_SIMILARITY", "0.95")),
+        ttl=3600,
+    )
+
+# Metrics: OpenAI call latency (+ cache counters) on GET /stats, and
+# as Prometheus /metrics when prometheus-client is installed
+try:
+    from prometheus_client import Histogram, make_asgi_app
+    from prometheus_client.core import REGISTRY, CounterMetricFamily
+except ImportError:
+    Histogram = None
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last one: > 30s
+
+LLM_LATENCY = None
+if Histogram is not None:
+    LLM_LATENCY = Histogram(
+        "llm_latency_seconds", "OpenAI call latency", buckets=LATENCY_BUCKETS
+    )
+
+
+def observe_llm_latency(start_ns: int):
+    """Record an OpenAI call that started at perf_counter_ns() == start_ns"""
+    seconds = (time.perf_counter_ns() - start_ns) / 1e9
+    latency_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    if LLM_LATENCY is not None:
+        LLM_LATENCY.observe(seconds)
+
+
+class CacheCollector:
+    """Exports the cache's own hit/miss counters at scrape time"""
+
+    def collect(self):
+        for name in ("hits", "semantic_hits", "misses"):
+            yield CounterMetricFamily(
+                f"llm_cache_{name}", f"LLM cache {name}", value=getattr(cache, name)
+            )
+
+
+if Histogram is not None and cache is not None:
+    REGISTRY.register(CacheCollector())
 
 
 # FastAPI application
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client, llm
+    http_client = create_http_client()
+    try:
+        # Initialize OpenAI model via LangChain
+        llm = ChatOpenAI(
+            model=MODEL,
+            temperature=TEMPERATURE,
+            http_async_client=http_client,
+        )
+        if cache is not None:
+            cache.embeddings = OpenAIEmbeddings(
+                model="text-embedding-3-small",
+                http_async_client=http_client,
+            )
+        yield
+    finally:
+        await http_client.aclose()
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is parsed with orjson instead of json"""
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route that hands FastAPI an ORJSONRequest (body parsing only;
+    validation and the OpenAPI schema are unchanged)"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def orjson_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_handler
+
+
+# orjson both ways: responses (default_response_class) and request bodies
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.router.route_class = ORJSONRoute
+if Histogram is not None:
+    app.mount("/metrics", make_asgi_app())
 
 class QuestionRequest(BaseModel):
     question: str
 
+
+def check_inflight():
+    """503 right away when LLM_INFLIGHT is exhausted"""
+    if LLM_INFLIGHT.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many requests in flight, retry later",
+            headers={"Retry-After": "1"},
+        )
+
+
 @app.post("/ask")
 async def ask_question(request: QuestionRequest):
-    response = chain.invoke({
-        "question": request.question
-    })
-    return {"answer": response}
+    # ainvoke: the OpenAI request awaits instead of blocking the event loop
+    # Only the text: the full AIMessage (metadata, token usage, ...)
+    # is several times larger to cache and to serialize
+    async def answer():
+        check_inflight()
+        async with LLM_INFLIGHT:
+            start = time.perf_counter_ns()
+            try:
+                response = await llm.ainvoke([
+                    SYSTEM_MESSAGE,
+                    HumanMessage(content=request.question),
+                ])
+            finally:
+                observe_llm_latency(start)
+        return response.content
+
+    if cache is None:
+        text = await answer()
+    else:
+        text = await cache.get_or_compute(request.question, answer)
+    return ORJSONResponse({"answer": text})
+
+
+class InflightStreamingResponse(StreamingResponse):
+    """StreamingResponse that gives back an LLM_INFLIGHT permit when done
+
+    The endpoint takes the permit (so a full semaphore is a 503, not a
+    200 that then waits); it is released however the response ends:
+    fully streamed, client disconnect, or an error before/while sending.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            LLM_INFLIGHT.release()
+
+
+@app.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    # Server-Sent Events: tokens are sent as they arrive, so the client
+    # sees the first words after ~first-token latency, not the full answer.
+    # Each event is a JSON string (answers can contain newlines)
+    messages = [SYSTEM_MESSAGE, HumanMessage(content=request.question)]
+
+    async def events():
+        start = time.perf_counter_ns()
+        try:
+            async for chunk in llm.astream(messages):
+                if chunk.content:
+                    yield b"data: " + orjson.dumps(chunk.content) + b"\n\n"
+        finally:
+            observe_llm_latency(start)
+        yield b"data: [DONE]\n\n"
+
+    # Check and take the permit with no await in between: acquire()
+    # on an unlocked semaphore returns without suspending
+    check_inflight()
+    await LLM_INFLIGHT.acquire()
+    try:
+        return InflightStreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except BaseException:
+        LLM_INFLIGHT.release()
+        raise
+
 
+@app.get("/stats")
+async def stats():
+    # Latency: number of OpenAI calls per bucket (upper bound in seconds)
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "llm_latency_seconds": dict(
+            zip([*map(str, LATENCY_BUCKETS), "+Inf"], latency_counts)
+        ),
+    }